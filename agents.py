@@ -90,6 +90,36 @@ def get_move_from_groq(board_state: str, valid_moves: list):
     response = client.generate_text(prompt)
     return response.result
 
+# Shared by both players and kept ahead of the mark-specific line,
+# so X and O send byte-identical system prompts up to their final line.
+PLAYER_RULES = dedent("""
+    You are a player in a Tic Tac Toe game. Your goal is to win by placing three of your marks in a row.
+
+    BOARD LAYOUT:
+    - The board is a 3x3 grid with coordinates from (0,0) to (2,2)
+    - Top-left is (0,0), bottom-right is (2,2)
+
+    RULES:
+    - You can only place your mark in empty spaces (shown as "." on the board)
+    - Players take turns placing their marks
+    - First to get 3 marks in a row (horizontal, vertical, or diagonal) wins
+    - If all spaces are filled with no winner, the game is a draw
+
+    YOUR RESPONSE:
+    - Provide ONLY two numbers separated by a space (row column)
+    - Example: "1 2" places your mark in row 1, column 2
+    - Choose only from the valid moves list provided to you
+
+    STRATEGY TIPS:
+    - Study the board carefully and make strategic moves
+    - Block your opponent's potential winning moves
+    - Create opportunities for multiple winning paths
+    - Pay attention to the valid moves and avoid illegal moves
+    """)
+
+def player_description(mark: str) -> str:
+    return f"{PLAYER_RULES}\nYOUR MARK: You are Player {mark} and place {mark}.\n"
+
 def get_tic_tac_toe_players(
     model_x: str = "openai:gpt-4",
     model_o: str = "openai:o3-mini",
@@ -103,62 +133,46 @@ def get_tic_tac_toe_players(
 
     player_x = Agent(
         name="Player X",
-        description=dedent("""
-        You are Player X in a Tic Tac Toe game. Your goal is to win by placing three X's in a row.
-
-        BOARD LAYOUT:
-        - The board is a 3x3 grid with coordinates from (0,0) to (2,2)
-        - Top-left is (0,0), bottom-right is (2,2)
-
-        RULES:
-        - You can only place X in empty spaces (shown as " " on the board)
-        - Players take turns placing their marks
-        - First to get 3 marks in a row (horizontal, vertical, or diagonal) wins
-        - If all spaces are filled with no winner, the game is a draw
-
-        YOUR RESPONSE:
-        - Provide ONLY two numbers separated by a space (row column)
-        - Example: "1 2" places your X in row 1, column 2
-        - Choose only from the valid moves list provided to you
-
-        STRATEGY TIPS:
-        - Study the board carefully and make strategic moves
-        - Block your opponent's potential winning moves
-        - Create opportunities for multiple winning paths
-        - Pay attention to the valid moves and avoid illegal moves
-        """),
+        description=player_description("X"),
         model=model_x,
         debug_mode=debug_mode,
     )
 
     player_o = Agent(
         name="Player O",
+        description=player_description("O"),
+        model=model_o,
+        debug_mode=debug_mode,
+    )
+
+    return player_x, player_o
+
+def get_batch_player(model: str = "openai:gpt-4", debug_mode: bool = False) -> Agent:
+    provider, model_name = model.split(":", 1)
+
+    return Agent(
+        name="Batch Player",
         description=dedent("""
-        You are Player O in a Tic Tac Toe game. Your goal is to win by placing three O's in a row.
+        You choose moves for several independent Tic Tac Toe games at once.
 
         BOARD LAYOUT:
-        - The board is a 3x3 grid with coordinates from (0,0) to (2,2)
+        - Each board is a 3x3 grid with coordinates from (0,0) to (2,2)
         - Top-left is (0,0), bottom-right is (2,2)
 
         RULES:
-        - You can only place O in empty spaces (shown as " " on the board)
-        - Players take turns placing their marks
+        - Each board states which mark (X or O) is to play
+        - Only place a mark in an empty space (shown as "." on the board)
         - First to get 3 marks in a row (horizontal, vertical, or diagonal) wins
-        - If all spaces are filled with no winner, the game is a draw
 
         YOUR RESPONSE:
-        - Provide ONLY two numbers separated by a space (row column)
-        - Example: "1 2" places your O in row 1, column 2
-        - Choose only from the valid moves list provided to you
+        - One line per board: the board id, a colon, then row and column
+        - Example: "b1: 1 2" plays row 1, column 2 on board b1
+        - Choose only from each board's valid moves list
 
         STRATEGY TIPS:
-        - Study the board carefully and make strategic moves
-        - Block your opponent's potential winning moves
-        - Create opportunities for multiple winning paths
-        - Pay attention to the valid moves and avoid illegal moves
+        - Take a winning move when one is available
+        - Otherwise block your opponent's winning moves
         """),
-        model=model_o,
+        model=get_model_for_provider(provider, model_name),
         debug_mode=debug_mode,
     )
-
-    return player_x, player_o
\ No newline at end of file
@@ -1,12 +1,14 @@
 import nest_asyncio
 import os
-import re
 import streamlit as st
 from dotenv import load_dotenv
 from game_state import initialize_game, start_new_game, reset_game
 from ui_components import render_game_title
-from agents import get_tic_tac_toe_players
+from agents import get_tic_tac_toe_players, get_batch_player
+from batching import MoveBatcher, MOVE_BATCH_WINDOW_MS
 from agno.utils.log import logger
+from prompts import build_move_prompt, move_token_report, parse_move
+from profiling import RerunProfiler, PROFILE_CPROFILE
 from utils import (
     TicTacToe,
     display_board,
@@ -14,6 +16,7 @@ from utils import (
     show_agent_status,
     get_video_base64,
     play_sound_on_move,
+    display_profile_panel,
     GLOW_CSS,
     DARK_CSS,
     LIGHT_CSS,
@@ -59,27 +62,57 @@ if os.path.exists(video_path):
     """, unsafe_allow_html=True)
 
 
+# 📦 One batcher per model, shared by every session on this server
+@st.cache_resource
+def get_move_batcher(model_id: str) -> MoveBatcher:
+    return MoveBatcher(lambda: get_batch_player(model_id), window_ms=MOVE_BATCH_WINDOW_MS)
+
+
+def request_move(agent, model_id: str, game: TicTacToe) -> str:
+    logger.info(move_token_report(game))
+
+    def ask_alone() -> str:
+        response = agent.run(build_move_prompt(game), stream=False)
+        return response.content if response else ""
+
+    if MOVE_BATCH_WINDOW_MS > 0:
+        return get_move_batcher(model_id).request_move(game, ask_alone)
+    return ask_alone()
+
+
 # ✅ MAIN FUNCTION
 def main():
     # Init session state
     initialize_game()
 
+    # ⏱️ Opt-in per-rerun timing; the summary is shown on the next rerun
+    profiler = RerunProfiler(enabled=st.session_state.profiling_enabled, use_cprofile=PROFILE_CPROFILE)
+    try:
+        render_app(profiler)
+    finally:
+        summary = profiler.finish()
+        if summary:
+            st.session_state.last_rerun_profile = summary
+
+
+def render_app(profiler: RerunProfiler):
     # Apply theme
-    if st.session_state.theme_choice == "Glow":
-        st.markdown(GLOW_CSS, unsafe_allow_html=True)
-    elif st.session_state.theme_choice == "Dark":
-        st.markdown(DARK_CSS, unsafe_allow_html=True)
-    else:
-        st.markdown(LIGHT_CSS, unsafe_allow_html=True)
-
-    # Apply grid brightness
-    st.markdown(f"""
-    <style>
-    body::before {{
-        opacity: {st.session_state.grid_opacity};
-    }}
-    </style>
-    """, unsafe_allow_html=True)
+    with profiler.phase("theme"):
+        if st.session_state.theme_choice == "Glow":
+            st.markdown(GLOW_CSS, unsafe_allow_html=True)
+        elif st.session_state.theme_choice == "Dark":
+            st.markdown(DARK_CSS, unsafe_allow_html=True)
+        else:
+            st.markdown(LIGHT_CSS, unsafe_allow_html=True)
+
+        # Apply grid brightness
+        st.markdown(f"""
+        <style>
+        body::before {{
+            opacity: {st.session_state.grid_opacity};
+        }}
+        </style>
+        """, unsafe_allow_html=True)
 
     # 🚀 Welcome screen
     if not st.session_state.get("enter_game"):
@@ -102,7 +135,7 @@ def main():
     render_game_title()
 
     # 🛠️ Settings drawer
-    with st.expander("🛠️ Display & Audio Settings", expanded=False):
+    with profiler.phase("settings"), st.expander("🛠️ Display & Audio Settings", expanded=False):
         theme_choice = st.radio(
             "🎨 Choose Theme",
             ["Glow", "Dark", "Light"],
@@ -124,8 +157,12 @@ def main():
         sound_toggle = st.checkbox("🔊 Enable Move Sound", value=st.session_state.sound_enabled)
         st.session_state.sound_enabled = sound_toggle
 
+        st.session_state.profiling_enabled = st.checkbox(
+            "⏱️ Profile Reruns", value=st.session_state.profiling_enabled
+        )
+
     # 🎛️ Sidebar game controls
-    with st.sidebar:
+    with profiler.phase("sidebar"), st.sidebar:
         st.markdown("### Game Controls")
         model_options = {
             "GPT-4": "openai:gpt-4",
@@ -169,13 +206,17 @@ def main():
             if st.button("🧹 Reset All"):
                 st.session_state.confirm_reset = True
 
+        if st.session_state.profiling_enabled:
+            display_profile_panel(st.session_state.last_rerun_profile)
+
     # 🧠 Gameplay logic
     if st.session_state.game_started:
         st.markdown(f"<h3 style='color:#87CEEB; text-align:center;'>{selected_p_x} vs {selected_p_o}</h3>", unsafe_allow_html=True)
         status = st.session_state.game_board.get_game_status()
         game_over = "wins" in status.lower() or "draw" in status.lower()
 
-        display_board(st.session_state.game_board)
+        with profiler.phase("board"):
+            display_board(st.session_state.game_board)
 
         if game_over:
             winner_player = "X" if "X wins" in status else "O" if "O wins" in status else None
@@ -198,37 +239,30 @@ def main():
             avatar = AGENT_AVATARS.get(current_model_name, "🤖")
 
             show_agent_status(f"Player {current_player} ({current_model_name})", "is thinking...")
-            display_move_history()
+            with profiler.phase("move_history"):
+                display_move_history()
 
             if not st.session_state.game_paused:
-                valid_moves = st.session_state.game_board.get_valid_moves()
                 current_agent = st.session_state.player_x if current_player == "X" else st.session_state.player_o
 
-                response = current_agent.run(
-                    f"""
-                    Current board state:\n{st.session_state.game_board.get_board_state()}\n
-                    Available valid moves (row, col): {valid_moves}\n
-                    Choose your next move from the valid moves above.
-                    Respond with ONLY two numbers for row and column, e.g. "1 2".
-                    """,
-                    stream=False,
-                )
+                with profiler.phase("agent"):
+                    content = request_move(current_agent, model_options[current_model_name], st.session_state.game_board)
 
                 try:
-                    numbers = re.findall(r"\d+", response.content if response else "")
-                    row, col = map(int, numbers[:2])
+                    row, col = parse_move(content)
                     success, message = st.session_state.game_board.make_move(row, col)
 
                     if success:
                         if st.session_state.sound_enabled:
                             play_sound_on_move()
 
-                        explanation = response.content.strip() if response else "No explanation provided."
-                        st.session_state.move_history.append({
-                            "player": f"{avatar} Player {current_player} ({current_model_name})",
-                            "move": f"{row},{col}",
-                            "explanation": explanation
-                        })
+                        explanation = content.strip() or "No explanation provided."
+                        st.session_state.move_history.append(
+                            player=f"{avatar} Player {current_player} ({current_model_name})",
+                            row=row,
+                            col=col,
+                            explanation=explanation,
+                        )
                         st.rerun()
                     else:
                         logger.error(f"Invalid move attempt: {message}")
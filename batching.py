@@ -0,0 +1,130 @@
+import os
+import queue
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, List, Optional
+
+from agno.utils.log import logger
+from prompts import build_batch_prompt, count_tokens, parse_batch_reply, tokenizer_name
+
+# --- Settings (override via environment) ---
+MOVE_BATCH_WINDOW_MS = float(os.getenv("MOVE_BATCH_WINDOW_MS", "0"))  # 0 disables batching in the app
+MOVE_BATCH_MAX = int(os.getenv("MOVE_BATCH_MAX", "8"))
+
+
+class _PendingMove:
+    __slots__ = ("game", "fallback", "future")
+
+    def __init__(self, game, fallback: Callable[[], str]):
+        self.game = game
+        self.fallback = fallback
+        self.future: Future = Future()
+
+
+# --- Cross-game move batching for one model ---
+class MoveBatcher:
+    """
+    Collects move requests for the same model that arrive within `window_ms`
+    and sends them as a single multi-board prompt to an agent made by
+    `agent_factory`. Each caller gets back a "row col" reply; boards the batch
+    reply does not answer with a valid move are re-asked on their own through
+    the caller's `fallback`.
+    """
+
+    def __init__(
+        self,
+        agent_factory: Callable[[], object],
+        window_ms: float = 50,
+        max_batch: int = MOVE_BATCH_MAX,
+        limiter=None,
+        workers: int = 8,
+    ):
+        self.agent_factory = agent_factory
+        self.window = window_ms / 1000
+        self.max_batch = max(1, max_batch)
+        self.limiter = limiter
+        self.batch_sizes: Counter = Counter()
+        self.fallbacks = 0
+        self._queue: "queue.Queue[_PendingMove]" = queue.Queue()
+        self._pool = ThreadPoolExecutor(max_workers=workers)
+        self._lock = threading.Lock()
+        threading.Thread(target=self._collect, daemon=True).start()
+
+    def submit(self, game, fallback: Callable[[], str]) -> Future:
+        pending = _PendingMove(game, fallback)
+        self._queue.put(pending)
+        return pending.future
+
+    def request_move(self, game, fallback: Callable[[], str], timeout: Optional[float] = None) -> str:
+        return self.submit(game, fallback).result(timeout)
+
+    def stats(self) -> dict:
+        with self._lock:
+            batches = sum(self.batch_sizes.values())
+            requests = sum(size * count for size, count in self.batch_sizes.items())
+            return {
+                "requests": requests,
+                "batches": batches,
+                "mean_batch_size": round(requests / batches, 2) if batches else 0.0,
+                "batch_sizes": dict(sorted(self.batch_sizes.items())),
+                "fallbacks": self.fallbacks,
+            }
+
+    def _collect(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.window
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            with self._lock:
+                self.batch_sizes[len(batch)] += 1
+            self._pool.submit(self._dispatch, batch)
+
+    def _dispatch(self, batch: List[_PendingMove]):
+        # A lone request gains nothing from the batch format, so it goes out as-is.
+        if len(batch) == 1:
+            self._fallback(batch[0], count=False)
+            return
+
+        ids = [f"b{i}" for i in range(1, len(batch) + 1)]
+        try:
+            if self.limiter:
+                self.limiter.wait()
+            # Agents keep per-run state and memory on the instance, so concurrent batches
+            # must not share one, and a fresh agent per batch keeps that memory from piling up.
+            agent = self.agent_factory()
+            prompt = build_batch_prompt(list(zip(ids, (p.game for p in batch))))
+            logger.info(
+                f"Batch prompt tokens ({tokenizer_name()}): "
+                f"{count_tokens(prompt) / len(batch):.1f} per move over {len(batch)} boards"
+            )
+            response = agent.run(prompt, stream=False)
+            answers = parse_batch_reply(response.content if response else "")
+        except Exception as e:
+            logger.error(f"Batched move request failed: {str(e)}")
+            answers = {}
+        logger.info(f"Batched {len(batch)} moves, {len(answers)} answered")
+
+        for board_id, pending in zip(ids, batch):
+            move = answers.get(board_id)
+            if move in pending.game.get_valid_moves():
+                pending.future.set_result(f"{move[0]} {move[1]}")
+            else:
+                self._pool.submit(self._fallback, pending)
+
+    def _fallback(self, pending: _PendingMove, count: bool = True):
+        if count:
+            with self._lock:
+                self.fallbacks += 1
+        try:
+            pending.future.set_result(pending.fallback())
+        except Exception as e:
+            pending.future.set_exception(e)
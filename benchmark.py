@@ -0,0 +1,345 @@
+"""
+Position-Suite Benchmark
+---------------------------------
+Measures how well a model plays by asking it for a move in every reachable,
+unfinished 3x3 position (one representative per symmetry class) and checking
+the answer against the exact game value.
+
+Usage Examples:
+---------------
+1. Benchmark a model with the defaults:
+   python benchmark.py --model openai:gpt-4
+
+2. Stay under a provider's rate limit:
+   python benchmark.py --model groq:llama-3.3-70b-versatile --concurrency 8 --rpm 30
+
+Responses are appended to a JSONL cache as they arrive, so an interrupted run
+resumes where it stopped and reruns only query positions not seen before.
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from typing import Dict, List, Optional, Set
+
+from prompts import build_move_prompt, legacy_move_prompt_tokens, move_prompt_tokens, parse_move, tokenizer_name
+from utils import TicTacToe, X_PLAYER, O_PLAYER, COMPACT_EMPTY
+
+# --- Board geometry (row-major compact boards, see TicTacToe.to_compact) ---
+LINES = [
+    (0, 1, 2), (3, 4, 5), (6, 7, 8),
+    (0, 3, 6), (1, 4, 7), (2, 5, 8),
+    (0, 4, 8), (2, 4, 6),
+]
+
+# Index maps for the 8 rotations/reflections of the board
+SYMMETRIES = [
+    (0, 1, 2, 3, 4, 5, 6, 7, 8),
+    (6, 3, 0, 7, 4, 1, 8, 5, 2),
+    (8, 7, 6, 5, 4, 3, 2, 1, 0),
+    (2, 5, 8, 1, 4, 7, 0, 3, 6),
+    (2, 1, 0, 5, 4, 3, 8, 7, 6),
+    (6, 7, 8, 3, 4, 5, 0, 1, 2),
+    (0, 3, 6, 1, 4, 7, 2, 5, 8),
+    (8, 5, 2, 7, 4, 1, 6, 3, 0),
+]
+
+PHASES = [("opening", 0, 2), ("middlegame", 3, 5), ("endgame", 6, 8)]
+
+DEFAULT_CACHE = "benchmark_cache.jsonl"
+
+
+# --- Exact solver ---
+def side_to_move(board: str) -> str:
+    return X_PLAYER if board.count(X_PLAYER) == board.count(O_PLAYER) else O_PLAYER
+
+
+def winner(board: str) -> Optional[str]:
+    for a, b, c in LINES:
+        if board[a] != COMPACT_EMPTY and board[a] == board[b] == board[c]:
+            return board[a]
+    return None
+
+
+def is_terminal(board: str) -> bool:
+    return winner(board) is not None or COMPACT_EMPTY not in board
+
+
+def play(board: str, index: int) -> str:
+    return board[:index] + side_to_move(board) + board[index + 1:]
+
+
+@lru_cache(maxsize=None)
+def solve(board: str) -> int:
+    """Game value for the side to move: 1 win, 0 draw, -1 loss."""
+    if winner(board):
+        return -1
+    if COMPACT_EMPTY not in board:
+        return 0
+    return max(-solve(play(board, i)) for i, cell in enumerate(board) if cell == COMPACT_EMPTY)
+
+
+def best_moves(board: str) -> Set[int]:
+    value = solve(board)
+    return {i for i, cell in enumerate(board) if cell == COMPACT_EMPTY and -solve(play(board, i)) == value}
+
+
+def canonical(board: str) -> str:
+    return min("".join(board[i] for i in symmetry) for symmetry in SYMMETRIES)
+
+
+def enumerate_positions() -> List[str]:
+    """All reachable non-terminal positions, one canonical board per symmetry class."""
+    seen = {COMPACT_EMPTY * 9}
+    frontier = [COMPACT_EMPTY * 9]
+    while frontier:
+        board = frontier.pop()
+        for i, cell in enumerate(board):
+            if cell != COMPACT_EMPTY:
+                continue
+            child = canonical(play(board, i))
+            if child not in seen and not is_terminal(child):
+                seen.add(child)
+                frontier.append(child)
+    return sorted(seen, key=lambda board: (9 - board.count(COMPACT_EMPTY), board))
+
+
+def phase_of(board: str) -> str:
+    marks = 9 - board.count(COMPACT_EMPTY)
+    return next(name for name, low, high in PHASES if low <= marks <= high)
+
+
+def to_game(board: str) -> TicTacToe:
+    game = TicTacToe()
+    for i, cell in enumerate(board):
+        if cell != COMPACT_EMPTY:
+            game.board[i // 3][i % 3] = cell
+    game.current_player = side_to_move(board)
+    return game
+
+
+# --- Response cache ---
+def cache_key(model: str, prompt: str) -> str:
+    return hashlib.sha256(f"{model}\n{prompt}".encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Append-only JSONL store of raw model replies keyed by model and prompt."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.records: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # a run killed mid-write leaves a partial last line
+                    self.records[record["key"]] = record
+
+    def get(self, key: str) -> Optional[dict]:
+        return self.records.get(key)
+
+    def add(self, record: dict) -> None:
+        with self._lock:
+            self.records[record["key"]] = record
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+
+
+# --- Rate limiting ---
+class RateLimiter:
+    """Spaces requests evenly so no more than `per_minute` start in any minute."""
+
+    def __init__(self, per_minute: float):
+        self.interval = 60.0 / per_minute if per_minute > 0 else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+# --- Runner ---
+class PositionBenchmark:
+    def __init__(
+        self,
+        model: str,
+        cache: ResponseCache,
+        concurrency: int = 4,
+        rpm: float = 60,
+        retries: int = 3,
+        batch_window_ms: float = 0,
+        batch_max: int = 8,
+    ):
+        self.model = model
+        self.cache = cache
+        self.concurrency = concurrency
+        self.limiter = RateLimiter(rpm)
+        self.retries = retries
+        self._local = threading.local()
+        self.batcher = None
+        if batch_window_ms > 0:
+            from agents import get_batch_player
+            from batching import MoveBatcher
+            self.batcher = MoveBatcher(
+                lambda: get_batch_player(model), window_ms=batch_window_ms, max_batch=batch_max,
+                limiter=self.limiter, workers=concurrency,
+            )
+        # Batched replies come from a different prompt, so they are cached separately.
+        self.cache_model = f"{model} (batched)" if self.batcher else model
+
+    def _player(self, mark: str):
+        # Agents keep per-run state, so each worker thread gets its own pair.
+        if not hasattr(self._local, "players"):
+            from agents import get_tic_tac_toe_players
+            self._local.players = get_tic_tac_toe_players(self.model, self.model, debug_mode=False)
+        player_x, player_o = self._local.players
+        return player_x if mark == X_PLAYER else player_o
+
+    def _ask_alone(self, board: str, prompt: str) -> str:
+        self.limiter.wait()
+        response = self._player(side_to_move(board)).run(prompt, stream=False)
+        return response.content if response else ""
+
+    def _ask(self, board: str, prompt: str, key: str) -> dict:
+        for attempt in range(self.retries + 1):
+            start = time.perf_counter()
+            try:
+                if self.batcher:
+                    content = self.batcher.request_move(to_game(board), lambda: self._ask_alone(board, prompt))
+                else:
+                    content = self._ask_alone(board, prompt)
+            except Exception:
+                if attempt == self.retries:
+                    raise
+                time.sleep(2 ** attempt)
+                continue
+            record = {
+                "key": key,
+                "model": self.cache_model,
+                "position": board,
+                "response": content,
+                "latency_ms": round((time.perf_counter() - start) * 1000, 1),
+            }
+            self.cache.add(record)
+            return record
+
+    def run(self, positions: List[str]) -> List[dict]:
+        records, pending = [], []
+        for board in positions:
+            prompt = build_move_prompt(to_game(board))
+            key = cache_key(self.cache_model, prompt)
+            cached = self.cache.get(key)
+            if cached:
+                records.append(cached)
+            else:
+                pending.append((board, prompt, key))
+
+        print(f"{len(positions)} positions: {len(records)} cached, {len(pending)} to query")
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            futures = {pool.submit(self._ask, *job): job[0] for job in pending}
+            for done, future in enumerate(as_completed(futures), 1):
+                try:
+                    records.append(future.result())
+                except Exception as e:
+                    print(f"  failed {futures[future]}: {e}")
+                if done % 25 == 0 or done == len(futures):
+                    print(f"  {done}/{len(futures)} answered")
+        if self.batcher:
+            print(f"Batching: {self.batcher.stats()}")
+        return records
+
+
+# --- Scoring ---
+def score(record: dict) -> str:
+    """Classify a reply as 'correct', 'suboptimal' or 'illegal'."""
+    board = record["position"]
+    try:
+        row, col = parse_move(record["response"])
+    except ValueError:
+        return "illegal"
+    if not (0 <= row < 3 and 0 <= col < 3) or board[row * 3 + col] != COMPACT_EMPTY:
+        return "illegal"
+    return "correct" if row * 3 + col in best_moves(board) else "suboptimal"
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def report(model: str, positions: List[str], records: List[dict]) -> None:
+    by_position = {record["position"]: record for record in records}
+    print(f"\nModel: {model}")
+    print(f"{'phase':<12}{'positions':>10}{'answered':>10}{'accuracy':>10}{'illegal':>10}")
+    for name, _, _ in PHASES + [("overall", 0, 8)]:
+        boards = [board for board in positions if name == "overall" or phase_of(board) == name]
+        results = [score(by_position[board]) for board in boards if board in by_position]
+        accuracy = results.count("correct") / len(results) if results else 0.0
+        illegal = results.count("illegal") / len(results) if results else 0.0
+        print(f"{name:<12}{len(boards):>10}{len(results):>10}{accuracy:>10.1%}{illegal:>10.1%}")
+
+    if positions:
+        games = [to_game(board) for board in positions]
+        tokens = [move_prompt_tokens(game) for game in games]
+        legacy = sum(legacy_move_prompt_tokens(game) for game in games) / len(games)
+        print(
+            f"\nPrompt tokens per move ({tokenizer_name()}): legacy {legacy:.1f} (mean)"
+            f" -> {tokens[0][0]} shared prefix + {sum(board for _, board in tokens) / len(tokens):.1f} board (mean)"
+        )
+
+    latencies = [by_position[board]["latency_ms"] for board in positions if board in by_position]
+    if latencies:
+        print(
+            f"\nLatency (ms): p50 {percentile(latencies, 50):.0f}"
+            f"  p90 {percentile(latencies, 90):.0f}"
+            f"  p99 {percentile(latencies, 99):.0f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score a model on every distinct Tic Tac Toe position.")
+    parser.add_argument("--model", default="openai:gpt-4", help="provider:model, as in get_tic_tac_toe_players")
+    parser.add_argument("--concurrency", type=int, default=4, help="parallel requests")
+    parser.add_argument("--rpm", type=float, default=60, help="max requests per minute (0 = unlimited)")
+    parser.add_argument("--retries", type=int, default=3, help="retries per position on request errors")
+    parser.add_argument("--cache", default=DEFAULT_CACHE, help="JSONL file of collected responses")
+    parser.add_argument(
+        "--batch-window-ms", type=float, default=0,
+        help="collect concurrent requests for this long and send them as one prompt (0 = off)",
+    )
+    parser.add_argument("--batch-max", type=int, default=8, help="most boards per batched prompt")
+    parser.add_argument("--limit", type=int, default=None, help="only use the first N positions")
+    args = parser.parse_args()
+
+    positions = enumerate_positions()[:args.limit]
+    benchmark = PositionBenchmark(
+        args.model,
+        ResponseCache(args.cache),
+        concurrency=args.concurrency,
+        rpm=args.rpm,
+        retries=args.retries,
+        batch_window_ms=args.batch_window_ms,
+        batch_max=args.batch_max,
+    )
+    records = benchmark.run(positions)
+    report(args.model, positions, records)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,7 @@
 import streamlit as st
 from utils import TicTacToe
+from move_history import MoveHistory, MOVE_HISTORY_PAGE
+from profiling import PROFILE_RERUNS
 from agents import get_tic_tac_toe_players
 
 
@@ -10,7 +12,9 @@ def initialize_game():
     if "game_paused" not in st.session_state:
         st.session_state.game_paused = False
     if "move_history" not in st.session_state:
-        st.session_state.move_history = []
+        st.session_state.move_history = MoveHistory()
+    if "history_visible" not in st.session_state:
+        st.session_state.history_visible = MOVE_HISTORY_PAGE
     if "game_board" not in st.session_state:
         st.session_state.game_board = None
     if "player_x" not in st.session_state:
@@ -31,6 +35,10 @@ def initialize_game():
         st.session_state.grid_opacity = 0.15  # default 15%
     if "sound_enabled" not in st.session_state:
         st.session_state.sound_enabled = True
+    if "profiling_enabled" not in st.session_state:
+        st.session_state.profiling_enabled = PROFILE_RERUNS
+    if "last_rerun_profile" not in st.session_state:
+        st.session_state.last_rerun_profile = None
 
     # --- Score tracking ---
     if "score_x" not in st.session_state:
@@ -47,16 +55,18 @@ def start_new_game(model_x, model_o):
     st.session_state.game_paused = False
     st.session_state.game_started = True
     st.session_state.game_over = False
-    st.session_state.move_history = []
+    st.session_state.move_history.new_game()
+    st.session_state.history_visible = MOVE_HISTORY_PAGE
     st.rerun()
 
 
 def reset_game():
     keys_to_clear = [
-        "game_started", "game_paused", "move_history",
+        "game_started", "game_paused", "move_history", "history_visible",
         "game_board", "player_x", "player_o", "game_over",
         "enter_game", "confirm_reset",
         "theme_choice", "grid_opacity", "sound_enabled",
+        "profiling_enabled", "last_rerun_profile",
         "score_x", "score_o"
     ]
     for key in keys_to_clear:
@@ -0,0 +1,74 @@
+import os
+import sys
+from collections import Counter, deque
+from itertools import islice
+from typing import Dict, Iterator, List
+
+# --- Limits (override via environment) ---
+MOVE_HISTORY_LIMIT = int(os.getenv("MOVE_HISTORY_LIMIT", "200"))
+MOVE_HISTORY_PAGE = int(os.getenv("MOVE_HISTORY_PAGE", "10"))
+
+
+# --- Compact move record ---
+class MoveRecord:
+    __slots__ = ("game", "player", "row", "col", "explanation")
+
+    def __init__(self, game: int, player: str, row: int, col: int, explanation: str):
+        self.game = game
+        # Player labels come from a small fixed set, so interning them is safe even though
+        # interned strings may outlive every record (they are never freed on Python 3.12).
+        self.player = sys.intern(player)
+        self.row = row
+        self.col = col
+        self.explanation = explanation
+
+    @property
+    def move(self) -> str:
+        return f"{self.row},{self.col}"
+
+
+# --- Bounded history shared across games ---
+class MoveHistory:
+    """Ring buffer of moves; the oldest entries are dropped once `limit` is reached."""
+
+    def __init__(self, limit: int = MOVE_HISTORY_LIMIT):
+        self._moves = deque(maxlen=max(1, limit))
+        # Model replies repeat often ("1 2") but are free-form, so they are deduplicated here rather
+        # than interned: an entry is dropped once the last record using it leaves the ring buffer.
+        self._explanations: Dict[str, str] = {}
+        self._explanation_refs: Counter = Counter()
+        self.game = 0
+
+    def new_game(self) -> None:
+        self.game += 1
+
+    def append(self, player: str, row: int, col: int, explanation: str) -> MoveRecord:
+        if len(self._moves) == self._moves.maxlen:
+            self._release(self._moves[0].explanation)
+        explanation = self._explanations.setdefault(explanation, explanation)
+        self._explanation_refs[explanation] += 1
+        record = MoveRecord(self.game, player, row, col, explanation)
+        self._moves.append(record)
+        return record
+
+    def _release(self, explanation: str) -> None:
+        self._explanation_refs[explanation] -= 1
+        if not self._explanation_refs[explanation]:
+            del self._explanation_refs[explanation]
+            del self._explanations[explanation]
+
+    def latest(self, count: int) -> List[MoveRecord]:
+        """Return the newest `count` moves, oldest first."""
+        if count <= 0:
+            return []
+        return list(islice(reversed(self._moves), count))[::-1]
+
+    @property
+    def limit(self) -> int:
+        return self._moves.maxlen
+
+    def __len__(self) -> int:
+        return len(self._moves)
+
+    def __iter__(self) -> Iterator[MoveRecord]:
+        return iter(self._moves)
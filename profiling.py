@@ -0,0 +1,102 @@
+import cProfile
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+# --- Settings (override via environment) ---
+PROFILE_RERUNS = os.getenv("PROFILE_RERUNS", "0") == "1"
+PROFILE_CPROFILE = os.getenv("PROFILE_CPROFILE", "0") == "1"
+PROFILE_LOG = os.getenv("PROFILE_LOG", "rerun_profile.jsonl")
+PROFILE_TOP_FUNCTIONS = 10
+
+_CPROFILE_LOCK = threading.Lock()
+
+# From 3.12 cProfile records through sys.monitoring, which sees every thread in the process
+# (other sessions' reruns, MoveBatcher workers), and its stats carry no thread information to filter on.
+CPROFILE_SCOPE = "process" if sys.version_info >= (3, 12) else "thread"
+
+
+# --- Per-rerun phase timer ---
+class RerunProfiler:
+    """Times named phases of one Streamlit rerun and optionally samples it with cProfile."""
+
+    def __init__(self, enabled: bool = False, use_cprofile: bool = False, log_path: Optional[str] = PROFILE_LOG):
+        self.enabled = enabled
+        self.log_path = log_path
+        self.phases: Dict[str, float] = {}
+        self._start = time.perf_counter()
+        self._cprofile = None
+        self.sampling_skipped = False
+        if enabled and use_cprofile:
+            self._start_sampling()
+
+    def _start_sampling(self):
+        # Only one cProfile can be active per process (sys.monitoring on 3.12+), so concurrent
+        # sessions take turns and a rerun that finds it busy just skips sampling.
+        if not _CPROFILE_LOCK.acquire(blocking=False):
+            self.sampling_skipped = True
+            return
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:  # another profiler, e.g. a debugger, already holds it
+            _CPROFILE_LOCK.release()
+            self.sampling_skipped = True
+            return
+        self._cprofile = profile
+
+    @contextmanager
+    def phase(self, name: str):
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            # Phases can repeat within a rerun, so durations accumulate.
+            self.phases[name] = self.phases.get(name, 0.0) + (time.perf_counter() - start) * 1000
+
+    def finish(self) -> Optional[dict]:
+        """Close the rerun, append it to the log file and return the summary."""
+        if not self.enabled:
+            return None
+        total_ms = (time.perf_counter() - self._start) * 1000
+        summary = {
+            "timestamp": time.time(),
+            "total_ms": round(total_ms, 3),
+            "phases_ms": {name: round(ms, 3) for name, ms in self.phases.items()},
+        }
+        if self._cprofile:
+            self._cprofile.disable()
+            _CPROFILE_LOCK.release()
+            summary["hotspots"] = _top_functions(self._cprofile)
+            summary["hotspots_scope"] = CPROFILE_SCOPE
+            self._cprofile = None
+        elif self.sampling_skipped:
+            summary["hotspots_skipped"] = True
+        if self.log_path:
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(summary) + "\n")
+        return summary
+
+
+def _top_functions(profile: cProfile.Profile, limit: int = PROFILE_TOP_FUNCTIONS) -> List[dict]:
+    stats = pstats.Stats(profile, stream=io.StringIO())
+    stats.sort_stats("cumulative")
+    hotspots = []
+    for func in stats.fcn_list[:limit]:
+        _, ncalls, _, cumtime, _ = stats.stats[func]
+        filename, line, name = func
+        hotspots.append({
+            "function": f"{os.path.basename(filename)}:{line}({name})",
+            "calls": ncalls,
+            "cumulative_ms": round(cumtime * 1000, 3),
+        })
+    return hotspots
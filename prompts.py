@@ -0,0 +1,124 @@
+import re
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+# --- Compact board encoding ---
+# Bump the version whenever the encoding or the prompt prefix below changes.
+BOARD_ENCODING_VERSION = "v1"
+
+
+def encode_board(game) -> str:
+    """Rows of the compact board joined by "/", e.g. "X.O/.X./..O"."""
+    compact = game.to_compact()
+    return "/".join(compact[i:i + 3] for i in range(0, 9, 3))
+
+
+def encode_moves(game) -> str:
+    return " ".join(f"{row},{col}" for row, col in game.get_valid_moves())
+
+
+BOARD_ENCODING_RULES = f"""Board {BOARD_ENCODING_VERSION}: rows top to bottom split by "/", "." is empty; moves are row,col from 0-2.
+"""
+
+
+# --- Move prompt shared by the app and the benchmark ---
+# The prefix never changes between moves, so providers can serve it from their prompt cache;
+# only the short board lines after it differ per call.
+MOVE_PROMPT_PREFIX = BOARD_ENCODING_RULES + """Reply with ONLY the row and column of one valid move, e.g. "1 2".
+"""
+
+MOVE_PROMPT_BOARD = "board: {board}\nvalid: {moves}\n"
+
+
+def build_move_prompt(game) -> str:
+    return MOVE_PROMPT_PREFIX + MOVE_PROMPT_BOARD.format(board=encode_board(game), moves=encode_moves(game))
+
+
+BATCH_PROMPT_PREFIX = BOARD_ENCODING_RULES + """Each line below is an independent game. Reply with one line per board id
+in the form "<board id>: <row> <col>", e.g. "b1: 1 2", using only that board's valid moves.
+"""
+
+BATCH_BOARD = "{board_id}: board {board} to play {player} valid {moves}\n"
+
+# One answer per line; nothing may cross a newline, so a blank or echoed line never borrows digits from the next.
+BATCH_REPLY_LINE = re.compile(
+    r"^[^\w\n]*(?:board[^\S\n]+)?(b\d+)\**[^\S\n]*[:=-][^\S\n]*\(?(\d)[^\d\n]+(\d)\)?[^\S\n]*$",
+    re.IGNORECASE | re.MULTILINE,
+)
+
+
+def build_batch_prompt(games: List[Tuple[str, object]]) -> str:
+    return BATCH_PROMPT_PREFIX + "".join(
+        BATCH_BOARD.format(
+            board_id=board_id, board=encode_board(game), player=game.current_player, moves=encode_moves(game)
+        )
+        for board_id, game in games
+    )
+
+
+def parse_batch_reply(content: str) -> Dict[str, Tuple[int, int]]:
+    """Map board ids to the (row, col) answered for them; unparseable lines are skipped."""
+    return {
+        board_id.lower(): (int(row), int(col))
+        for board_id, row, col in BATCH_REPLY_LINE.findall(content or "")
+    }
+
+
+def parse_move(content: str) -> Tuple[int, int]:
+    """Read the first two numbers of a reply as (row, col); raises ValueError otherwise."""
+    numbers = re.findall(r"\d+", content or "")
+    row, col = map(int, numbers[:2])
+    return row, col
+
+
+# --- Token accounting ---
+# The move prompt as app.main sent it before the compact encoding, kept to report before/after token counts.
+LEGACY_MOVE_PROMPT = (
+    "\n                    Current board state:\n{board_state}\n\n"
+    "                    Available valid moves (row, col): {valid_moves}\n\n"
+    "                    Choose your next move from the valid moves above.\n"
+    '                    Respond with ONLY two numbers for row and column, e.g. "1 2".\n'
+    "                    "
+)
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None  # tiktoken is optional and needs its vocabulary on first use
+
+
+def count_tokens(text: str) -> int:
+    """cl100k token count when tiktoken is available, otherwise a word/punctuation estimate."""
+    encoding = _encoding()
+    if encoding:
+        return len(encoding.encode(text))
+    return len(re.findall(r"\w+|[^\w\s]|\s{2,}", text))
+
+
+def tokenizer_name() -> str:
+    return "tiktoken cl100k_base" if _encoding() else "regex estimate"
+
+
+def move_prompt_tokens(game) -> Tuple[int, int]:
+    """(cacheable prefix tokens, per-move tokens) for the move prompt of `game`."""
+    prompt = build_move_prompt(game)
+    return count_tokens(MOVE_PROMPT_PREFIX), count_tokens(prompt[len(MOVE_PROMPT_PREFIX):])
+
+
+def legacy_move_prompt_tokens(game) -> int:
+    return count_tokens(
+        LEGACY_MOVE_PROMPT.format(board_state=game.get_board_state(), valid_moves=game.get_valid_moves())
+    )
+
+
+def move_token_report(game) -> str:
+    """One-line before/after token comparison for the move prompt of `game`."""
+    prefix_tokens, board_tokens = move_prompt_tokens(game)
+    return (
+        f"Move prompt tokens ({tokenizer_name()}): legacy {legacy_move_prompt_tokens(game)}"
+        f" -> {prefix_tokens} shared prefix + {board_tokens} board"
+    )
@@ -0,0 +1,91 @@
+import re
+import threading
+import time
+from batching import MoveBatcher
+from prompts import build_batch_prompt, parse_batch_reply
+from utils import TicTacToe
+
+class FakeAgent:
+    def __init__(self, reply):
+        self.reply = reply
+        self.prompts = []
+
+    def run(self, prompt, stream=False):
+        self.prompts.append(prompt)
+        return type("Response", (object,), {"content": self.reply})
+
+class StatefulAgent:
+    """Answers each board with its first valid move, keeping the reply on the instance like agno's Agent."""
+
+    def run(self, prompt, stream=False):
+        self.run_response = type("Response", (object,), {"content": "\n".join(
+            f"{board_id}: {row} {col}"
+            for board_id, row, col in re.findall(r"^(b\d+): .* valid (\d),(\d)", prompt, re.MULTILINE)
+        )})
+        time.sleep(0.2)
+        return self.run_response
+
+def request_concurrently(batcher, games, fallback):
+    barrier = threading.Barrier(len(games))
+    replies = [None] * len(games)
+
+    def play(i):
+        barrier.wait()
+        replies[i] = batcher.request_move(games[i], fallback, timeout=5)
+
+    threads = [threading.Thread(target=play, args=(i,)) for i in range(len(games))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return replies
+
+def test_batch_prompt_round_trip():
+    game = TicTacToe()
+    prompt = build_batch_prompt([("b1", game), ("b2", game)])
+    assert "b1: board .../.../... to play X" in prompt and "\nb2: " in prompt
+    assert parse_batch_reply("b1: 1 2\nBoard b2: (0, 0)\nnonsense") == {"b1": (1, 2), "b2": (0, 0)}
+
+def test_batch_reply_lines_do_not_borrow_from_the_next_line():
+    assert parse_batch_reply("b1: pass\nb2: 1 1") == {"b2": (1, 1)}
+    assert parse_batch_reply("b1: skip\nb2: 2 0\nb3: 1 1") == {"b2": (2, 0), "b3": (1, 1)}
+    assert parse_batch_reply("b1:\n1 1") == {}
+
+def test_echoed_board_line_is_not_an_answer():
+    assert parse_batch_reply("b1: board X.O/.../... to play X valid 0,1 1,0") == {}
+    assert parse_batch_reply("b1: board X.O/.../... to play X valid 0,1 1,0\nb1: 1 0") == {"b1": (1, 0)}
+
+def test_concurrent_requests_share_one_prompt():
+    agent = FakeAgent("b1: 0 0\nb2: 1 1\nb3: 9 9")
+    batcher = MoveBatcher(lambda: agent, window_ms=200, max_batch=3)
+    replies = request_concurrently(batcher, [TicTacToe() for _ in range(3)], lambda: "2 2")
+
+    assert len(agent.prompts) == 1
+    # Submission order decides ids, so only the multiset of replies is fixed;
+    # the invalid "9 9" answer is re-asked through the fallback.
+    assert sorted(replies) == ["0 0", "1 1", "2 2"]
+    assert batcher.stats()["batch_sizes"] == {3: 1}
+    assert batcher.stats()["fallbacks"] == 1
+
+def test_overlapping_batches_keep_their_own_replies():
+    # Each game's first valid move differs, so a reply from the other batch would be caught.
+    games = []
+    for moves in [[], [(0, 0)], [(0, 0), (0, 1)], [(0, 0), (0, 1), (0, 2)]]:
+        game = TicTacToe()
+        for move in moves:
+            game.make_move(*move)
+        games.append(game)
+    batcher = MoveBatcher(StatefulAgent, window_ms=200, max_batch=2)
+
+    replies = request_concurrently(batcher, games, lambda: "fallback")
+
+    assert replies == ["0 0", "0 1", "0 2", "1 0"]
+    assert batcher.stats()["batch_sizes"] == {2: 2}
+    assert batcher.stats()["fallbacks"] == 0
+
+def test_missing_answer_line_falls_back():
+    agent = FakeAgent("b1: 0 0\nb2: pass")
+    batcher = MoveBatcher(lambda: agent, window_ms=200, max_batch=2)
+    replies = request_concurrently(batcher, [TicTacToe(), TicTacToe()], lambda: "2 2")
+    assert sorted(replies) == ["0 0", "2 2"]
+    assert batcher.stats()["fallbacks"] == 1
@@ -0,0 +1,21 @@
+from benchmark import enumerate_positions, solve, best_moves, canonical, score, percentile
+
+def test_position_suite_size():
+    positions = enumerate_positions()
+    assert len(positions) == 627
+    assert all(canonical(board) == board for board in positions)
+
+def test_exact_values():
+    assert solve(".........") == 0
+    assert best_moves("XX.OO....") == {2}
+    assert solve("XX.OO....") == 1
+
+def test_score_classifies_replies():
+    assert score({"position": "XX.OO....", "response": "0 2"}) == "correct"
+    assert score({"position": "XX.OO....", "response": "2 2"}) == "suboptimal"
+    assert score({"position": "XX.OO....", "response": "0 0"}) == "illegal"
+    assert score({"position": "XX.OO....", "response": "no idea"}) == "illegal"
+
+def test_percentile():
+    assert percentile([40, 10, 30, 20], 50) == 20
+    assert percentile([5], 99) == 5
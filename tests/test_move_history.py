@@ -0,0 +1,40 @@
+from move_history import MoveHistory
+
+def test_history_is_capped():
+    history = MoveHistory(limit=3)
+    for i in range(5):
+        history.append("Player X", 0, i % 3, "0 0")
+    assert len(history) == 3
+    assert [move.col for move in history] == [2, 0, 1]
+
+def test_latest_returns_newest_in_order():
+    history = MoveHistory(limit=10)
+    for i in range(4):
+        history.append("Player O", 1, i % 3, f"1 {i}")
+    assert [move.explanation for move in history.latest(2)] == ["1 2", "1 3"]
+    assert history.latest(0) == []
+
+def test_history_spans_games():
+    history = MoveHistory(limit=10)
+    history.new_game()
+    history.append("Player X", 0, 0, "0 0")
+    history.new_game()
+    history.append("Player X", 1, 1, "1 1")
+    assert [move.game for move in history] == [1, 2]
+    assert history.latest(1)[0].move == "1,1"
+
+def test_explanation_table_stays_bounded():
+    history = MoveHistory(limit=3)
+    for i in range(10):
+        history.append("Player X", 0, 0, f"reply {i}")
+    assert len(history._explanations) <= 3
+    assert [move.explanation for move in history] == ["reply 7", "reply 8", "reply 9"]
+
+def test_repeated_explanations_share_one_copy():
+    history = MoveHistory(limit=4)
+    for _ in range(4):
+        history.append("Player O", 1, 1, "".join(["1", " ", "1"]))
+    first, *rest = list(history)
+    assert all(move.explanation is first.explanation for move in rest)
+    history.append("Player O", 2, 2, "2 2")
+    assert set(history._explanations) == {"1 1", "2 2"}
@@ -0,0 +1,42 @@
+import json
+import sys
+from profiling import RerunProfiler
+
+def test_disabled_profiler_records_nothing(tmp_path):
+    log = tmp_path / "profile.jsonl"
+    profiler = RerunProfiler(enabled=False, log_path=str(log))
+    with profiler.phase("board"):
+        pass
+    assert profiler.finish() is None
+    assert not log.exists()
+
+def test_phases_are_logged_per_rerun(tmp_path):
+    log = tmp_path / "profile.jsonl"
+    for _ in range(2):
+        profiler = RerunProfiler(enabled=True, log_path=str(log))
+        with profiler.phase("theme"):
+            pass
+        with profiler.phase("board"):
+            pass
+        summary = profiler.finish()
+    assert set(summary["phases_ms"]) == {"theme", "board"}
+    lines = log.read_text().splitlines()
+    assert len(lines) == 2
+    assert json.loads(lines[-1])["total_ms"] >= 0
+
+def test_cprofile_hotspots(tmp_path):
+    profiler = RerunProfiler(enabled=True, use_cprofile=True, log_path=str(tmp_path / "p.jsonl"))
+    with profiler.phase("agent"):
+        sum(range(1000))
+    summary = profiler.finish()
+    assert summary["hotspots"]
+    assert summary["hotspots_scope"] == ("process" if sys.version_info >= (3, 12) else "thread")
+
+def test_concurrent_cprofile_sampling_is_skipped(tmp_path):
+    log = str(tmp_path / "p.jsonl")
+    first = RerunProfiler(enabled=True, use_cprofile=True, log_path=log)
+    second = RerunProfiler(enabled=True, use_cprofile=True, log_path=log)
+    assert second.finish()["hotspots_skipped"]
+    assert first.finish()["hotspots"]
+    third = RerunProfiler(enabled=True, use_cprofile=True, log_path=log)
+    assert third.finish()["hotspots"]
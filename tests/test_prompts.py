@@ -0,0 +1,40 @@
+from prompts import (
+    MOVE_PROMPT_PREFIX,
+    build_move_prompt,
+    encode_board,
+    legacy_move_prompt_tokens,
+    move_prompt_tokens,
+    move_token_report,
+    tokenizer_name,
+)
+from utils import TicTacToe
+
+def test_board_encoding():
+    game = TicTacToe()
+    game.make_move(1, 1)
+    game.make_move(0, 2)
+    assert encode_board(game) == "..O/.X./..."
+
+def test_prompt_prefix_is_stable():
+    game = TicTacToe()
+    first = build_move_prompt(game)
+    game.make_move(2, 2)
+    second = build_move_prompt(game)
+    assert first.startswith(MOVE_PROMPT_PREFIX) and second.startswith(MOVE_PROMPT_PREFIX)
+    assert "valid: 0,0 0,1 0,2 1,0 1,1 1,2 2,0 2,1\n" in second
+
+def test_board_tokens_shrink_as_game_fills():
+    game = TicTacToe()
+    prefix, opening = move_prompt_tokens(game)
+    for move in [(1, 1), (0, 0), (2, 2)]:
+        game.make_move(*move)
+    assert move_prompt_tokens(game)[0] == prefix
+    assert move_prompt_tokens(game)[1] < opening
+
+def test_token_report_compares_with_legacy_prompt():
+    game = TicTacToe()
+    game.make_move(1, 1)
+    report = move_token_report(game)
+    assert tokenizer_name() in report
+    assert f"legacy {legacy_move_prompt_tokens(game)} ->" in report
+    assert legacy_move_prompt_tokens(game) > move_prompt_tokens(game)[1]
@@ -17,4 +17,11 @@ def test_invalid_move_same_spot():
 def test_winner_detection():
     game = TicTacToe()
     game.board = [["X", "X", "X"], [" ", "O", "O"], [" ", " ", " "]]
-    assert game.check_winner() == "X"
\ No newline at end of file
+    assert game.check_winner() == "X"
+
+def test_compact_board():
+    game = TicTacToe()
+    assert game.to_compact() == "........."
+    game.make_move(0, 0)
+    game.make_move(1, 2)
+    assert game.to_compact() == "X....O..."
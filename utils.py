@@ -1,12 +1,16 @@
 from typing import List, Optional, Tuple
 import streamlit as st
+import streamlit.components.v1 as components
 import base64
+import os
 import re
+from move_history import MOVE_HISTORY_PAGE
 
 # --- Constants ---
 X_PLAYER = "X"
 O_PLAYER = "O"
 EMPTY = " "
+COMPACT_EMPTY = "."
 
 # --- Weapon-style Emoji Avatars for Agents ---
 AGENT_AVATARS = {
@@ -41,6 +45,10 @@ class TicTacToe:
     def get_board_state(self) -> str:
         return "\n".join([" | ".join(row) for row in self.board])
 
+    def to_compact(self) -> str:
+        """Row-major 9-character board, e.g. "X.O......" (empty cells are ".")."""
+        return "".join(COMPACT_EMPTY if cell == EMPTY else cell for row in self.board for cell in row)
+
     def check_winner(self) -> Optional[str]:
         for row in self.board:
             if row[0] != EMPTY and row.count(row[0]) == 3:
@@ -66,45 +74,59 @@ class TicTacToe:
         return "Game in progress"
 
 # --- Display the Tic-Tac-Toe Board ---
+# One persistent component; reruns only ship the 9-character state and the last move index.
+_board_component = components.declare_component(
+    "tic_tac_toe_board",
+    path=os.path.join(os.path.dirname(os.path.abspath(__file__)), "board_component"),
+)
+
 def display_board(game: TicTacToe):
-    for i in range(3):
-        cols = st.columns(3)
-        for j in range(3):
-            cell = game.board[i][j]
-            highlight = game.last_move == (i, j)
-
-            symbol = "❌" if cell == "X" else "⭕" if cell == "O" else " "
-            glow_color = "#00ffff" if cell == "O" else "#ff004f" if cell == "X" else "#333"
-            text_glow = f"text-shadow: 0 0 8px {glow_color}, 0 0 16px {glow_color};"
-
-            style = f"""
-                background-color: #111827;
-                color: {glow_color};
-                font-size: 42px;
-                font-weight: bold;
-                height: 100px;
-                width: 100%;
-                border: 3px solid {glow_color};
-                border-radius: 20px;
-                box-shadow: 0 0 12px {glow_color};
-                {text_glow}
-            """
-
-            if highlight:
-                style += f" background-color: {glow_color}; color: #111827; animation: flash 0.4s ease-in-out;"
-
-            cols[j].markdown(
-                f"<button style='{style}' disabled>{symbol}</button>",
-                unsafe_allow_html=True
-            )
+    last = game.last_move[0] * 3 + game.last_move[1] if game.last_move else -1
+    _board_component(state=game.to_compact(), last=last, key="board", default=None)
 
 # --- Move History Display ---
 def display_move_history():
+    history = st.session_state.move_history
     st.markdown("### 📝 Move History (Chat Style)")
-    for move in st.session_state.move_history:
-        st.markdown(f"🧠 **{move['player']}** moved to **{move['move']}**")
-        if "explanation" in move:
-            st.markdown(f"<div style='margin-left:20px; color:#ccc;'>{move['explanation']}</div>", unsafe_allow_html=True)
+
+    # Only the newest entries are rendered; older ones are loaded on demand.
+    visible = st.session_state.get("history_visible", MOVE_HISTORY_PAGE)
+    if len(history) > visible:
+        if st.button(f"⬆️ Load older moves ({len(history) - visible} hidden)", key="load_older_moves"):
+            st.session_state.history_visible = visible + MOVE_HISTORY_PAGE
+            st.rerun()
+
+    lines = []
+    game = None
+    for move in history.latest(visible):
+        if move.game != game:
+            game = move.game
+            lines.append(f"**🎮 Game {game}**")
+        lines.append(f"🧠 **{move.player}** moved to **{move.move}**")
+        lines.append(f"<div style='margin-left:20px; color:#ccc;'>{move.explanation}</div>")
+    if lines:
+        st.markdown("\n\n".join(lines), unsafe_allow_html=True)
+
+# --- Rerun Profiling Panel ---
+def display_profile_panel(profile: Optional[dict]):
+    st.markdown("### ⏱️ Last Rerun")
+    if not profile:
+        st.caption("Timings appear after the next rerun.")
+        return
+    rows = sorted(profile["phases_ms"].items(), key=lambda item: item[1], reverse=True)
+    lines = [f"- `{name}`: {ms:.1f} ms" for name, ms in rows]
+    lines.append(f"- **total**: {profile['total_ms']:.1f} ms")
+    st.markdown("\n".join(lines))
+    if profile.get("hotspots"):
+        with st.expander("cProfile hotspots"):
+            if profile.get("hotspots_scope") == "process":
+                st.caption("Process-wide: includes other sessions and background threads running during this rerun.")
+            st.markdown("\n".join(
+                f"- `{hit['function']}`: {hit['cumulative_ms']:.1f} ms ({hit['calls']} calls)"
+                for hit in profile["hotspots"]
+            ))
+    elif profile.get("hotspots_skipped"):
+        st.caption("cProfile was busy with another session, so this rerun was not sampled.")
 
 # --- Sound FX for Move ---
 def play_sound_on_move():
@@ -201,12 +223,6 @@ body::before {
     50% {opacity: 0.2;}
     100% {opacity: 0.15;}
 }
-
-@keyframes flash {
-    0% { box-shadow: 0 0 5px #fff; }
-    50% { box-shadow: 0 0 30px #fff; }
-    100% { box-shadow: 0 0 5px #fff; }
-}
 </style>
 """
 